@@ -241,7 +241,7 @@ class AdaptersMap:
         try:
             return dmap[oid]
         except KeyError:
-            info = self.types.get(oid)
+            info = self.types.get_by_oid(oid)
             if info:
                 msg = (
                     f"cannot find a dumper for type {info.name} (oid {oid})"
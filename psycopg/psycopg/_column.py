@@ -37,7 +37,7 @@ class Column(Sequence[Any]):
             fmod=res.fmod(index),
             fsize=res.fsize(index),
         )
-        self._type = cursor.adapters.types.get(self._data.ftype)
+        self._type = cursor.adapters.types.get_by_oid(self._data.ftype)
 
     _attrs = tuple(
         attrgetter(attr)
@@ -211,7 +211,7 @@ class Transformer(AdaptContext):
             try:
                 type_sql = self._oid_types[oid]
             except KeyError:
-                ti = self.adapters.types.get(oid)
+                ti = self.adapters.types.get_by_oid(oid)
                 if ti:
                     if oid < 8192:
                         # builtin: prefer "timestamptz" to "timestamp with time zone"
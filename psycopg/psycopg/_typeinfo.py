@@ -7,14 +7,20 @@ information to the adapters if needed.
 
 # Copyright (C) 2020 The Psycopg Team
 
-from typing import Any, Dict, Iterator, Optional, overload
-from typing import Sequence, Tuple, Type, TypeVar, Union, TYPE_CHECKING
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, overload
+from typing import Sequence, Tuple, Type, TypeVar, Union, cast, TYPE_CHECKING
+from weakref import WeakKeyDictionary
 from typing_extensions import TypeAlias
 
+from . import pq
 from . import sql
 from . import errors as e
 from .abc import AdaptContext, Query
-from .rows import dict_row
+from ._compat import cache
+from ._pipeline import BasePipeline
+from .rows import tuple_row
+from ._encodings import conn_encoding
 
 if TYPE_CHECKING:
     from .connection import BaseConnection, Connection
@@ -22,6 +28,23 @@ if TYPE_CHECKING:
 
 T = TypeVar("T", bound="TypeInfo")
 RegistryKey: TypeAlias = Union[str, int, Tuple[type, int]]
+ConnectionClasses: TypeAlias = Tuple[
+    Type["Connection[Any]"], Type["AsyncConnection[Any]"]
+]
+
+IDLE = pq.TransactionStatus.IDLE
+INTRANS = pq.TransactionStatus.INTRANS
+
+# Expressions to look up the names in the info queries. `to_regtype()` returns
+# the type oid or NULL, unlike the :: operator, which returns the type or
+# raises an exception, which requires a transaction rollback and leaves traces
+# in the server logs. The cast is only used if the function is not available.
+_TO_REGTYPE = sql.SQL("to_regtype(n.name)")
+_REGTYPE_CAST = sql.SQL("n.name::regtype")
+
+# Cache of the to_regtype() support by connection
+_to_regtype_support: "WeakKeyDictionary[BaseConnection[Any], bool]"
+_to_regtype_support = WeakKeyDictionary()
 
 
 class TypeInfo:
@@ -31,6 +54,21 @@ class TypeInfo:
 
     __module__ = "psycopg.types"
 
+    __slots__ = ("name", "oid", "array_oid", "regtype", "delimiter")
+
+    # Query to read the types info from the catalog. The types names are
+    # passed in the `names` parameter and looked up using the `{regtype}`
+    # placeholder, which is composed by `_get_info_query()`.
+    _info_query = """\
+SELECT
+    n.name AS fetch_name,
+    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
+    t.oid::regtype::text AS regtype, t.typdelim AS delimiter
+FROM unnest(%(names)s::text[]) AS n(name)
+JOIN pg_type t ON t.oid = {regtype}
+ORDER BY t.oid
+"""
+
     def __init__(
         self,
         name: str,
@@ -71,12 +109,10 @@ class TypeInfo:
         cls: Type[T], conn: "BaseConnection[Any]", name: Union[str, sql.Identifier]
     ) -> Any:
         """Query a system catalog to read information about a type."""
-        from .connection import Connection
-        from .connection_async import AsyncConnection
-
         if isinstance(name, sql.Composable):
             name = name.as_string(conn)
 
+        Connection, AsyncConnection = _connection_classes()
         if isinstance(conn, Connection):
             return cls._fetch(conn, name)
         elif isinstance(conn, AsyncConnection):
@@ -86,45 +122,250 @@ class TypeInfo:
                 f"expected Connection or AsyncConnection, got {type(conn).__name__}"
             )
 
+    @overload
     @classmethod
-    def _fetch(cls: Type[T], conn: "Connection[Any]", name: str) -> Optional[T]:
-        # This might result in a nested transaction. What we want is to leave
-        # the function with the connection in the state we found (either idle
-        # or intrans)
-        try:
-            with conn.transaction():
-                with conn.cursor(row_factory=dict_row) as cur:
-                    cur.execute(cls._get_info_query(conn), {"name": name})
-                    recs = cur.fetchall()
-        except e.UndefinedObject:
-            return None
+    def fetch_many(
+        cls: Type[T],
+        conn: "Connection[Any]",
+        names: Iterable[Union[str, sql.Identifier]],
+    ) -> Dict[str, T]:
+        ...
+
+    @overload
+    @classmethod
+    async def fetch_many(
+        cls: Type[T],
+        conn: "AsyncConnection[Any]",
+        names: Iterable[Union[str, sql.Identifier]],
+    ) -> Dict[str, T]:
+        ...
+
+    @classmethod
+    def fetch_many(
+        cls: Type[T],
+        conn: "BaseConnection[Any]",
+        names: Iterable[Union[str, sql.Identifier]],
+    ) -> Any:
+        """Query a system catalog to read information about several types."""
+        # Convert the names to strings, dropping duplicates
+        snames: Dict[str, None] = {}
+        for name in names:
+            if isinstance(name, sql.Composable):
+                name = name.as_string(conn)
+            snames[name] = None
+
+        Connection, AsyncConnection = _connection_classes()
+        if isinstance(conn, Connection):
+            return cls._fetch_many(conn, list(snames))
+        elif isinstance(conn, AsyncConnection):
+            return cls._fetch_many_async(conn, list(snames))
+        else:
+            raise TypeError(
+                f"expected Connection or AsyncConnection, got {type(conn).__name__}"
+            )
+
+    @overload
+    @classmethod
+    def fetch_base_types(
+        cls, conn: "Connection[Any]", oids: Optional[Iterable[int]] = None
+    ) -> List["TypeInfo"]:
+        ...
+
+    @overload
+    @classmethod
+    async def fetch_base_types(
+        cls, conn: "AsyncConnection[Any]", oids: Optional[Iterable[int]] = None
+    ) -> List["TypeInfo"]:
+        ...
 
-        return cls._from_records(name, recs)
+    @classmethod
+    def fetch_base_types(
+        cls, conn: "BaseConnection[Any]", oids: Optional[Iterable[int]] = None
+    ) -> Any:
+        """Query a system catalog to read information about all the base types."""
+        # The query only returns the columns of the base TypeInfo
+        if cls is not TypeInfo:
+            raise TypeError(
+                f"fetch_base_types() is not available on {cls.__name__},"
+                " only on TypeInfo"
+            )
+        if oids is not None:
+            oids = list(oids)
+
+        Connection, AsyncConnection = _connection_classes()
+        if isinstance(conn, Connection):
+            return cls._fetch_base_types(conn, oids)
+        elif isinstance(conn, AsyncConnection):
+            return cls._fetch_base_types_async(conn, oids)
+        else:
+            raise TypeError(
+                f"expected Connection or AsyncConnection, got {type(conn).__name__}"
+            )
+
+    @classmethod
+    def _fetch(cls: Type[T], conn: "Connection[Any]", name: str) -> Optional[T]:
+        return cls._fetch_many(conn, [name]).get(name)
 
     @classmethod
     async def _fetch_async(
         cls: Type[T], conn: "AsyncConnection[Any]", name: str
     ) -> Optional[T]:
-        try:
-            async with conn.transaction():
-                async with conn.cursor(row_factory=dict_row) as cur:
-                    await cur.execute(cls._get_info_query(conn), {"name": name})
-                    recs = await cur.fetchall()
-        except e.UndefinedObject:
-            return None
+        return (await cls._fetch_many_async(conn, [name])).get(name)
+
+    @classmethod
+    def _fetch_many(
+        cls: Type[T], conn: "Connection[Any]", names: Sequence[str]
+    ) -> Dict[str, T]:
+        if len(names) > 1 and not cls._has_to_regtype_function(conn):
+            # A single name not found would fail the entire query using the
+            # ::regtype cast, so look up the names one at time. Pipeline the
+            # queries, if possible, to save the roundtrips of the savepoints.
+            if BasePipeline.is_supported():
+                with conn.pipeline():
+                    return cls._fetch_each(conn, names)
+            else:
+                return cls._fetch_each(conn, names)
+
+        query = cls._get_info_query(conn)
+        if cls._needs_transaction(conn):
+            # This might result in a nested transaction. What we want is to
+            # leave the function with the connection in the state we found
+            # (either idle or intrans)
+            try:
+                with conn.transaction():
+                    recs = cls._execute(conn, query, {"names": names})
+            except e.UndefinedObject:
+                return {}
+        else:
+            recs = cls._execute(conn, query, {"names": names})
 
-        return cls._from_records(name, recs)
+        return cls._from_records(recs)
 
     @classmethod
-    def _from_records(
-        cls: Type[T], name: str, recs: Sequence[Dict[str, Any]]
-    ) -> Optional[T]:
-        if len(recs) == 1:
-            return cls(**recs[0])
-        elif not recs:
-            return None
+    async def _fetch_many_async(
+        cls: Type[T], conn: "AsyncConnection[Any]", names: Sequence[str]
+    ) -> Dict[str, T]:
+        if len(names) > 1 and not cls._has_to_regtype_function(conn):
+            if BasePipeline.is_supported():
+                async with conn.pipeline():
+                    return await cls._fetch_each_async(conn, names)
+            else:
+                return await cls._fetch_each_async(conn, names)
+
+        query = cls._get_info_query(conn)
+        if cls._needs_transaction(conn):
+            try:
+                async with conn.transaction():
+                    recs = await cls._execute_async(conn, query, {"names": names})
+            except e.UndefinedObject:
+                return {}
         else:
-            raise e.ProgrammingError(f"found {len(recs)} different types named {name}")
+            recs = await cls._execute_async(conn, query, {"names": names})
+
+        return cls._from_records(recs)
+
+    @classmethod
+    def _fetch_each(
+        cls: Type[T], conn: "Connection[Any]", names: Sequence[str]
+    ) -> Dict[str, T]:
+        rv: Dict[str, T] = {}
+        for name in names:
+            rv.update(cls._fetch_many(conn, [name]))
+        return rv
+
+    @classmethod
+    async def _fetch_each_async(
+        cls: Type[T], conn: "AsyncConnection[Any]", names: Sequence[str]
+    ) -> Dict[str, T]:
+        rv: Dict[str, T] = {}
+        for name in names:
+            rv.update(await cls._fetch_many_async(conn, [name]))
+        return rv
+
+    @classmethod
+    def _fetch_base_types(
+        cls, conn: "Connection[Any]", oids: Optional[Sequence[int]]
+    ) -> List["TypeInfo"]:
+        query = cls._get_bulk_info_query(oids is not None)
+        # The query can't fail, so a transaction block is only needed to leave
+        # the connection in the state we found it.
+        if cls._would_start_transaction(conn):
+            with conn.transaction():
+                recs = cls._execute(conn, query, {"oids": oids})
+        else:
+            recs = cls._execute(conn, query, {"oids": oids})
+
+        return [cls._from_record(rec) for rec in recs]
+
+    @classmethod
+    async def _fetch_base_types_async(
+        cls, conn: "AsyncConnection[Any]", oids: Optional[Sequence[int]]
+    ) -> List["TypeInfo"]:
+        query = cls._get_bulk_info_query(oids is not None)
+        if cls._would_start_transaction(conn):
+            async with conn.transaction():
+                recs = await cls._execute_async(conn, query, {"oids": oids})
+        else:
+            recs = await cls._execute_async(conn, query, {"oids": oids})
+
+        return [cls._from_record(rec) for rec in recs]
+
+    @classmethod
+    def _execute(
+        cls, conn: "Connection[Any]", query: Query, params: Dict[str, Any]
+    ) -> List[Tuple[Any, ...]]:
+        with conn.cursor(row_factory=tuple_row) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+    @classmethod
+    async def _execute_async(
+        cls, conn: "AsyncConnection[Any]", query: Query, params: Dict[str, Any]
+    ) -> List[Tuple[Any, ...]]:
+        async with conn.cursor(row_factory=tuple_row) as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+    @classmethod
+    def _needs_transaction(cls, conn: "BaseConnection[Any]") -> bool:
+        # The ::regtype cast raises an exception if the type is not found,
+        # which must be rolled back.
+        if not cls._has_to_regtype_function(conn):
+            return True
+
+        # to_regtype() returns NULL if the type is not found, but still raises
+        # an exception if the name is malformed, which would leave the
+        # transaction in error. The block is only not needed if there is no
+        # transaction to protect and the query wouldn't start one.
+        status = conn.pgconn.transaction_status
+        return not (status == IDLE and conn.autocommit)
+
+    @classmethod
+    def _would_start_transaction(cls, conn: "BaseConnection[Any]") -> bool:
+        # Return True if a query would leave the connection in a transaction,
+        # or if the status is not known, e.g. in pipeline mode.
+        status = conn.pgconn.transaction_status
+        if status == INTRANS:
+            return False
+        return not (status == IDLE and conn.autocommit)
+
+    @classmethod
+    def _from_records(cls: Type[T], recs: Sequence[Sequence[Any]]) -> Dict[str, T]:
+        rv: Dict[str, T] = {}
+        from_record = cls._from_record
+        for rec in recs:
+            # The name requested, which may differ from the type name
+            name = rec[0]
+            if name in rv:
+                raise e.ProgrammingError(f"found more than one type named {name}")
+            rv[name] = from_record(rec)
+        return rv
+
+    @classmethod
+    def _from_record(cls: Type[T], rec: Sequence[Any]) -> T:
+        # Create an object from a record returned by the info query
+        _, name, oid, array_oid, regtype, delimiter = rec
+        return cls(name, oid, array_oid, regtype=regtype, delimiter=delimiter)
 
     def register(self, context: Optional[AdaptContext] = None) -> None:
         """
@@ -146,44 +387,80 @@ class TypeInfo:
 
     @classmethod
     def _get_info_query(cls, conn: "BaseConnection[Any]") -> Query:
-        return sql.SQL(
-            """\
-SELECT
-    typname AS name, oid, typarray AS array_oid,
-    oid::regtype::text AS regtype, typdelim AS delimiter
-FROM pg_type t
-WHERE t.oid = {regtype}
-ORDER BY t.oid
-"""
-        ).format(regtype=cls._to_regtype(conn))
+        return cls._render_info_query(
+            cls._has_to_regtype_function(conn), conn_encoding(conn)
+        )
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _render_info_query(cls, has_to_regtype: bool, encoding: str) -> bytes:
+        # The query only depends on the class, on the to_regtype() support and
+        # on the connection encoding, so it can be rendered once for all the
+        # connections and passed to execute() without composing it again.
+        regtype = _TO_REGTYPE if has_to_regtype else _REGTYPE_CAST
+        query = sql.SQL(cls._info_query).format(regtype=regtype)
+        return query.as_string(None).encode(encoding)
+
+    @staticmethod
+    def _get_bulk_info_query(filter_oids: bool) -> Query:
+        return _BULK_INFO_QUERY_OIDS if filter_oids else _BULK_INFO_QUERY
 
     @classmethod
     def _has_to_regtype_function(cls, conn: "BaseConnection[Any]") -> bool:
+        # The server can't change in the connection lifetime: cache the result
+        try:
+            return _to_regtype_support[conn]
+        except KeyError:
+            pass
+
         # to_regtype() introduced in PostgreSQL 9.4 and CockroachDB 22.2
         info = conn.info
         if info.vendor == "PostgreSQL":
-            return info.server_version >= 90400
+            rv = info.server_version >= 90400
         elif info.vendor == "CockroachDB":
-            return info.server_version >= 220200
+            rv = info.server_version >= 220200
         else:
-            return False
+            rv = False
 
-    @classmethod
-    def _to_regtype(cls, conn: "BaseConnection[Any]") -> sql.SQL:
-        # `to_regtype()` returns the type oid or NULL, unlike the :: operator,
-        # which returns the type or raises an exception, which requires
-        # a transaction rollback and leaves traces in the server logs.
-
-        if cls._has_to_regtype_function(conn):
-            return sql.SQL("to_regtype(%(name)s)")
-        else:
-            return sql.SQL("%(name)s::regtype")
+        _to_regtype_support[conn] = rv
+        return rv
 
     def _added(self, registry: "TypesRegistry") -> None:
         """Method called by the `!registry` when the object is added there."""
         pass
 
 
+@cache
+def _connection_classes() -> ConnectionClasses:
+    # Imported here to avoid circular imports, and only once as the import
+    # statement is not free.
+    from .connection import Connection
+    from .connection_async import AsyncConnection
+
+    return Connection, AsyncConnection
+
+
+# Query to read all the base types, with their array oid, skipping the tables
+# row types and the arrays, which would make the result huge in databases with
+# many tables (see jackc/pgx#140). Records are in the same format of the info
+# query, with an unused first column.
+_BULK_INFO_QUERY_TEMPLATE = """\
+SELECT
+    NULL AS fetch_name,
+    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
+    t.oid::regtype::text AS regtype, t.typdelim AS delimiter
+FROM pg_type t
+LEFT JOIN pg_type elem ON elem.typarray = t.oid
+WHERE t.typtype = 'b'
+AND elem.oid IS NULL
+{filter}ORDER BY t.oid
+"""
+_BULK_INFO_QUERY = _BULK_INFO_QUERY_TEMPLATE.format(filter="")
+_BULK_INFO_QUERY_OIDS = _BULK_INFO_QUERY_TEMPLATE.format(
+    filter="AND t.oid = ANY(%(oids)s::oid[])\n"
+)
+
+
 class TypesRegistry:
     """
     Container for the information about types in a database.
@@ -193,11 +470,15 @@ class TypesRegistry:
 
     def __init__(self, template: Optional["TypesRegistry"] = None):
         self._registry: Dict[RegistryKey, TypeInfo]
+        # The objects added, by oid (or name, if the oid is unknown), in order
+        # to iterate on them without dupes or objects replaced
+        self._infos: Dict[Union[int, str], TypeInfo]
 
         # Make a shallow copy: it will become a proper copy if the registry
         # is edited.
         if template:
             self._registry = template._registry
+            self._infos = template._infos
             self._own_state = False
             template._own_state = False
         else:
@@ -205,28 +486,51 @@ class TypesRegistry:
 
     def clear(self) -> None:
         self._registry = {}
+        self._infos = {}
         self._own_state = True
 
     def add(self, info: TypeInfo) -> None:
-        self._ensure_own_state()
-        if info.oid:
-            self._registry[info.oid] = info
-        if info.array_oid:
-            self._registry[info.array_oid] = info
-        self._registry[info.name] = info
+        self.bulk_add((info,))
+
+    def bulk_add(self, infos: Iterable[TypeInfo]) -> None:
+        """
+        Add several types to the registry, in the order they are given.
+        """
+        # Time to write! so, copy. Checked inline, as in AdaptersMap, to avoid
+        # a method call on the add() path.
+        if not self._own_state:
+            self._registry = self._registry.copy()
+            self._infos = self._infos.copy()
+            self._own_state = True
 
-        if info.regtype and info.regtype not in self._registry:
-            self._registry[info.regtype] = info
+        registry = self._registry
+        keys: Dict[RegistryKey, TypeInfo] = {}
+        added: Dict[Union[int, str], TypeInfo] = {}
+        for info in infos:
+            if info.oid:
+                keys[info.oid] = info
+            if info.array_oid:
+                keys[info.array_oid] = info
+            keys[info.name] = info
+            # Register the array names too, so that lookup doesn't need parsing
+            keys[f"{info.name}[]"] = info
+
+            regtype = info.regtype
+            if regtype and regtype not in keys and regtype not in registry:
+                keys[regtype] = info
+                keys[f"{regtype}[]"] = info
+
+            added[info.oid or info.name] = info
+
+        registry.update(keys)
+        self._infos.update(added)
 
         # Allow info to customise further their relation with the registry
-        info._added(self)
+        for info in added.values():
+            info._added(self)
 
     def __iter__(self) -> Iterator[TypeInfo]:
-        seen = set()
-        for t in self._registry.values():
-            if id(t) not in seen:
-                seen.add(id(t))
-                yield t
+        return iter(self._infos.values())
 
     @overload
     def __getitem__(self, key: Union[str, int]) -> TypeInfo:
@@ -244,10 +548,7 @@ class TypesRegistry:
 
         Raise KeyError if not found.
         """
-        if isinstance(key, str):
-            if key.endswith("[]"):
-                key = key[:-2]
-        elif not isinstance(key, (int, tuple)):
+        if not isinstance(key, (str, int, tuple)):
             raise TypeError(f"the key must be an oid or a name, got {type(key)}")
         try:
             return self._registry[key]
@@ -275,6 +576,16 @@ class TypesRegistry:
         except KeyError:
             return None
 
+    def get_by_oid(self, oid: int) -> Optional[TypeInfo]:
+        """
+        Return info about a type, specified by oid
+
+        :param oid: the oid of the type to look for.
+
+        Return None if not found. Faster than `get()` for oid lookups.
+        """
+        return self._registry.get(oid)
+
     def get_oid(self, name: str) -> int:
         """
         Return the oid of a PostgreSQL type by name.
@@ -302,14 +613,18 @@ class TypesRegistry:
         :return: The `!TypeInfo` object of class `!cls` whose subtype is
             `!subtype`. `!None` if the element or its range are not found.
         """
-        try:
-            info = self[subtype]
-        except KeyError:
+        # Subtypes info are only indexed by oid: look up the subtype first, so
+        # that its current oid is used if it was registered again.
+        sub = self._registry.get(subtype)
+        if not sub:
             return None
-        return self.get((cls, info.oid))
+        return cast(Optional[T], self._registry.get((cls, sub.oid)))
 
-    def _ensure_own_state(self) -> None:
-        # Time to write! so, copy.
-        if not self._own_state:
-            self._registry = self._registry.copy()
-            self._own_state = True
+    def get_by_subtype_oid(self, cls: Type[T], oid: int) -> Optional[T]:
+        """
+        Return info about a `TypeInfo` subclass by its element oid.
+
+        Return None if not found. Faster than `get_by_subtype()` for oid
+        lookups.
+        """
+        return cast(Optional[T], self._registry.get((cls, oid)))
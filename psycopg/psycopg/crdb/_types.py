@@ -119,7 +119,7 @@ def _register_crdb_none_adapters(context: AdaptContext) -> None:
 
 
 def register_crdb_types(types: TypesRegistry) -> None:
-    for t in [
+    infos = [
         TypeInfo("json", 3802, 3807, regtype="jsonb"),  # Alias json -> jsonb.
         TypeInfo("int8", 20, 1016, regtype="integer"),  # Alias integer -> int8
         TypeInfo('"char"', 18, 1002),  # special case, not generated
@@ -160,5 +160,5 @@ def register_crdb_types(types: TypesRegistry) -> None:
         TypeInfo("varbit", 1562, 1563, regtype="bit varying"),
         TypeInfo("varchar", 1043, 1015, regtype="character varying"),
         # autogenerated: end
-    ]:
-        types.add(t)
+    ]
+    types.bulk_add(infos)
@@ -21,7 +21,7 @@ def register_default_types(types: TypesRegistry) -> None:
     from .types.multirange import MultirangeInfo
 
     # Use tools/update_oids.py to update this data.
-    for t in [
+    infos = [
         TypeInfo('"char"', 18, 1002),
         # autogenerated: start
         # Generated from PostgreSQL 15.1
@@ -101,8 +101,8 @@ def register_default_types(types: TypesRegistry) -> None:
         MultirangeInfo("tsmultirange", 4533, 6152, range_oid=3908, subtype_oid=1114),
         MultirangeInfo("tstzmultirange", 4534, 6153, range_oid=3910, subtype_oid=1184),
         # autogenerated: end
-    ]:
-        types.add(t)
+    ]
+    types.bulk_add(infos)
 
 
 def register_default_adapters(context: AdaptContext) -> None:
@@ -102,7 +102,7 @@ class BaseListDumper(RecursiveDumper):
         Return text info as fallback.
         """
         if base_oid:
-            info = self._tx.adapters.types.get(base_oid)
+            info = self._tx.adapters.types.get_by_oid(base_oid)
             if info:
                 return info
 
@@ -8,21 +8,17 @@ import re
 import struct
 from collections import namedtuple
 from typing import Any, Callable, cast, Iterator, List, Optional
-from typing import Sequence, Tuple, Type, TYPE_CHECKING
+from typing import Sequence, Tuple, Type
 
 from .. import pq
-from .. import sql
 from .. import postgres
-from ..abc import AdaptContext, Buffer, Query
+from ..abc import AdaptContext, Buffer
 from ..adapt import Transformer, PyFormat, RecursiveDumper, Loader
 from .._oids import TEXT_OID
 from .._struct import pack_len, unpack_len
 from .._typeinfo import TypeInfo
 from .._encodings import _as_python_identifier
 
-if TYPE_CHECKING:
-    from ..connection import BaseConnection
-
 _struct_oidlen = struct.Struct("!Ii")
 _pack_oidlen = cast(Callable[[int, int], bytes], _struct_oidlen.pack)
 _unpack_oidlen = cast(
@@ -33,6 +29,28 @@ _unpack_oidlen = cast(
 class CompositeInfo(TypeInfo):
     """Manage information about a composite type."""
 
+    __slots__ = ("field_names", "field_types", "python_type")
+
+    _info_query = """\
+SELECT
+    n.name AS fetch_name,
+    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
+    t.oid::regtype::text AS regtype,
+    coalesce(a.fnames, '{{}}') AS field_names,
+    coalesce(a.ftypes, '{{}}') AS field_types
+FROM unnest(%(names)s::text[]) AS n(name)
+JOIN pg_type t ON t.oid = {regtype}
+LEFT JOIN LATERAL (
+    SELECT
+        array_agg(a.attname ORDER BY a.attnum) AS fnames,
+        array_agg(a.atttypid ORDER BY a.attnum) AS ftypes
+    FROM pg_attribute a
+    WHERE a.attrelid = t.typrelid
+    AND a.attnum > 0
+    AND NOT a.attisdropped
+) a ON true
+"""
+
     def __init__(
         self,
         name: str,
@@ -50,34 +68,16 @@ class CompositeInfo(TypeInfo):
         self.python_type: Optional[type] = None
 
     @classmethod
-    def _get_info_query(cls, conn: "BaseConnection[Any]") -> Query:
-        return sql.SQL(
-            """\
-SELECT
-    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
-    t.oid::regtype::text AS regtype,
-    coalesce(a.fnames, '{{}}') AS field_names,
-    coalesce(a.ftypes, '{{}}') AS field_types
-FROM pg_type t
-LEFT JOIN (
-    SELECT
-        attrelid,
-        array_agg(attname) AS fnames,
-        array_agg(atttypid) AS ftypes
-    FROM (
-        SELECT a.attrelid, a.attname, a.atttypid
-        FROM pg_attribute a
-        JOIN pg_type t ON t.typrelid = a.attrelid
-        WHERE t.oid = {regtype}
-        AND a.attnum > 0
-        AND NOT a.attisdropped
-        ORDER BY a.attnum
-    ) x
-    GROUP BY attrelid
-) a ON a.attrelid = t.typrelid
-WHERE t.oid = {regtype}
-"""
-        ).format(regtype=cls._to_regtype(conn))
+    def _from_record(cls, rec: Sequence[Any]) -> "CompositeInfo":
+        _, name, oid, array_oid, regtype, field_names, field_types = rec
+        return cls(
+            name,
+            oid,
+            array_oid,
+            regtype=regtype,
+            field_names=field_names,
+            field_types=field_types,
+        )
 
 
 class SequenceDumper(RecursiveDumper):
@@ -3,21 +3,17 @@ Adapters for the enum type.
 """
 from enum import Enum
 from typing import Any, Dict, Generic, Optional, Mapping, Sequence
-from typing import Tuple, Type, TypeVar, Union, cast, TYPE_CHECKING
+from typing import Tuple, Type, TypeVar, Union, cast
 from typing_extensions import TypeAlias
 
-from .. import sql
 from .. import postgres
 from .. import errors as e
 from ..pq import Format
-from ..abc import AdaptContext, Query
+from ..abc import AdaptContext
 from ..adapt import Buffer, Dumper, Loader
 from .._encodings import conn_encoding
 from .._typeinfo import TypeInfo
 
-if TYPE_CHECKING:
-    from ..connection import BaseConnection
-
 E = TypeVar("E", bound=Enum)
 
 EnumDumpMap: TypeAlias = Dict[E, bytes]
@@ -28,6 +24,19 @@ EnumMapping: TypeAlias = Union[Mapping[E, str], Sequence[Tuple[E, str]], None]
 class EnumInfo(TypeInfo):
     """Manage information about an enum type."""
 
+    __slots__ = ("labels", "enum")
+
+    _info_query = """\
+SELECT
+    n.name AS fetch_name,
+    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
+    array_agg(e.enumlabel ORDER BY e.enumsortorder) AS labels
+FROM unnest(%(names)s::text[]) AS n(name)
+JOIN pg_type t ON t.oid = {regtype}
+LEFT JOIN pg_enum e ON e.enumtypid = t.oid
+GROUP BY n.name, t.typname, t.oid, t.typarray
+"""
+
     def __init__(
         self,
         name: str,
@@ -41,23 +50,9 @@ class EnumInfo(TypeInfo):
         self.enum: Optional[Type[Enum]] = None
 
     @classmethod
-    def _get_info_query(cls, conn: "BaseConnection[Any]") -> Query:
-        return sql.SQL(
-            """\
-SELECT name, oid, array_oid, array_agg(label) AS labels
-FROM (
-    SELECT
-        t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
-        e.enumlabel AS label
-    FROM pg_type t
-    LEFT JOIN  pg_enum e
-    ON e.enumtypid = t.oid
-    WHERE t.oid = {regtype}
-    ORDER BY e.enumsortorder
-) x
-GROUP BY name, oid, array_oid
-"""
-        ).format(regtype=cls._to_regtype(conn))
+    def _from_record(cls, rec: Sequence[Any]) -> "EnumInfo":
+        _, name, oid, array_oid, labels = rec
+        return cls(name, oid, array_oid, labels)
 
 
 class _BaseEnumLoader(Loader, Generic[E]):
@@ -6,10 +6,9 @@ Support for multirange types adaptation.
 
 from decimal import Decimal
 from typing import Any, Generic, List, Iterable, MutableSequence
-from typing import Optional, Type, Union, overload, TYPE_CHECKING
+from typing import Optional, Sequence, Type, Union, overload, TYPE_CHECKING
 from datetime import date, datetime
 
-from .. import sql
 from .. import _oids
 from .. import errors as e
 from .. import postgres
@@ -30,6 +29,18 @@ if TYPE_CHECKING:
 class MultirangeInfo(TypeInfo):
     """Manage information about a multirange type."""
 
+    __slots__ = ("range_oid", "subtype_oid")
+
+    _info_query = """\
+SELECT n.name AS fetch_name,
+    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
+    t.oid::regtype::text AS regtype,
+    r.rngtypid AS range_oid, r.rngsubtype AS subtype_oid
+FROM unnest(%(names)s::text[]) AS n(name)
+JOIN pg_type t ON t.oid = {regtype}
+JOIN pg_range r ON t.oid = r.rngmultitypid
+"""
+
     def __init__(
         self,
         name: str,
@@ -50,16 +61,19 @@ class MultirangeInfo(TypeInfo):
             raise e.NotSupportedError(
                 "multirange types are only available from PostgreSQL 14"
             )
-        return sql.SQL(
-            """\
-SELECT t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
-    t.oid::regtype::text AS regtype,
-    r.rngtypid AS range_oid, r.rngsubtype AS subtype_oid
-FROM pg_type t
-JOIN pg_range r ON t.oid = r.rngmultitypid
-WHERE t.oid = {regtype}
-"""
-        ).format(regtype=cls._to_regtype(conn))
+        return super()._get_info_query(conn)
+
+    @classmethod
+    def _from_record(cls, rec: Sequence[Any]) -> "MultirangeInfo":
+        _, name, oid, array_oid, regtype, range_oid, subtype_oid = rec
+        return cls(
+            name,
+            oid,
+            array_oid,
+            regtype=regtype,
+            range_oid=range_oid,
+            subtype_oid=subtype_oid,
+        )
 
     def _added(self, registry: "TypesRegistry") -> None:
         # Map multiranges ranges and subtypes to info
@@ -248,7 +262,7 @@ class BaseMultirangeDumper(RecursiveDumper):
         """
         Return the oid of the range from the oid of its elements.
         """
-        info = self._tx.adapters.types.get_by_subtype(MultirangeInfo, sub_oid)
+        info = self._tx.adapters.types.get_by_subtype_oid(MultirangeInfo, sub_oid)
         return info.oid if info else INVALID_OID
 
 
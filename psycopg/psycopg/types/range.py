@@ -6,24 +6,20 @@ Support for range types adaptation.
 
 import re
 from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar, Type, Tuple
-from typing import cast, TYPE_CHECKING
+from typing import Sequence, cast
 from decimal import Decimal
 from datetime import date, datetime
 
-from .. import sql
 from .. import _oids
 from .. import errors as e
 from .. import postgres
 from ..pq import Format
-from ..abc import AdaptContext, Buffer, Dumper, DumperKey, Query
+from ..abc import AdaptContext, Buffer, Dumper, DumperKey
 from ..adapt import RecursiveDumper, RecursiveLoader, PyFormat
 from .._oids import INVALID_OID, TEXT_OID
 from .._struct import pack_len, unpack_len
 from .._typeinfo import TypeInfo, TypesRegistry
 
-if TYPE_CHECKING:
-    from ..connection import BaseConnection
-
 RANGE_EMPTY = 0x01  # range is empty
 RANGE_LB_INC = 0x02  # lower bound is inclusive
 RANGE_UB_INC = 0x04  # upper bound is inclusive
@@ -38,6 +34,18 @@ T = TypeVar("T")
 class RangeInfo(TypeInfo):
     """Manage information about a range type."""
 
+    __slots__ = ("subtype_oid",)
+
+    _info_query = """\
+SELECT n.name AS fetch_name,
+    t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
+    t.oid::regtype::text AS regtype,
+    r.rngsubtype AS subtype_oid
+FROM unnest(%(names)s::text[]) AS n(name)
+JOIN pg_type t ON t.oid = {regtype}
+JOIN pg_range r ON t.oid = r.rngtypid
+"""
+
     def __init__(
         self,
         name: str,
@@ -51,17 +59,9 @@ class RangeInfo(TypeInfo):
         self.subtype_oid = subtype_oid
 
     @classmethod
-    def _get_info_query(cls, conn: "BaseConnection[Any]") -> Query:
-        return sql.SQL(
-            """\
-SELECT t.typname AS name, t.oid AS oid, t.typarray AS array_oid,
-    t.oid::regtype::text AS regtype,
-    r.rngsubtype AS subtype_oid
-FROM pg_type t
-JOIN pg_range r ON t.oid = r.rngtypid
-WHERE t.oid = {regtype}
-"""
-        ).format(regtype=cls._to_regtype(conn))
+    def _from_record(cls, rec: Sequence[Any]) -> "RangeInfo":
+        _, name, oid, array_oid, regtype, subtype_oid = rec
+        return cls(name, oid, array_oid, regtype=regtype, subtype_oid=subtype_oid)
 
     def _added(self, registry: TypesRegistry) -> None:
         # Map ranges subtypes to info
@@ -342,7 +342,7 @@ class BaseRangeDumper(RecursiveDumper):
         """
         Return the oid of the range from the oid of its elements.
         """
-        info = self._tx.adapters.types.get_by_subtype(RangeInfo, sub_oid)
+        info = self._tx.adapters.types.get_by_subtype_oid(RangeInfo, sub_oid)
         return info.oid if info else INVALID_OID
 
 
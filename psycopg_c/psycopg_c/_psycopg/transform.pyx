@@ -223,7 +223,7 @@ cdef class Transformer:
             type_ptr = PyDict_GetItem(<object>self._oid_types, oid)
             if type_ptr == NULL:
                 type_sql = b""
-                ti = self.adapters.types.get(oid)
+                ti = self.adapters.types.get_by_oid(oid)
                 if ti is not None:
                     if oid < 8192:
                         # builtin: prefer "timestamptz" to "timestamp with time zone"
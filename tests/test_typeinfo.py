@@ -1,8 +1,11 @@
+from typing import List, Union
+
 import pytest
 
 import psycopg
 from psycopg import sql
 from psycopg.pq import TransactionStatus
+from psycopg.rows import dict_row
 from psycopg.types import TypeInfo
 from psycopg.types.composite import CompositeInfo
 from psycopg.types.enum import EnumInfo
@@ -10,9 +13,20 @@ from psycopg.types.multirange import MultirangeInfo
 from psycopg.types.range import RangeInfo
 
 
-@pytest.mark.parametrize("name", ["text", sql.Identifier("text")])
+@pytest.fixture(scope="module")
+def testtype(svcconn):
+    # A non-builtin type, which TypeInfo.fetch() must look up in the catalog
+    svcconn.execute("drop type if exists testfetch")
+    svcconn.execute("create type testfetch as enum ('a', 'b')")
+    cur = svcconn.execute(
+        "select oid, typarray from pg_type where typname = 'testfetch'"
+    )
+    return cur.fetchone()
+
+
+@pytest.mark.parametrize("name", ["testfetch", sql.Identifier("testfetch")])
 @pytest.mark.parametrize("status", ["IDLE", "INTRANS"])
-def test_fetch(conn, name, status):
+def test_fetch(conn, testtype, name, status):
     status = getattr(TransactionStatus, status)
     if status == TransactionStatus.INTRANS:
         conn.execute("select 1")
@@ -21,19 +35,18 @@ def test_fetch(conn, name, status):
     info = TypeInfo.fetch(conn, name)
     assert conn.info.transaction_status == status
 
-    assert info.name == "text"
+    assert info.name == "testfetch"
     # TODO: add the schema?
-    # assert info.schema == "pg_catalog"
+    # assert info.schema == "public"
 
-    assert info.oid == psycopg.adapters.types["text"].oid
-    assert info.array_oid == psycopg.adapters.types["text"].array_oid
-    assert info.regtype == "text"
+    assert (info.oid, info.array_oid) == testtype
+    assert info.regtype == "testfetch"
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("name", ["text", sql.Identifier("text")])
+@pytest.mark.parametrize("name", ["testfetch", sql.Identifier("testfetch")])
 @pytest.mark.parametrize("status", ["IDLE", "INTRANS"])
-async def test_fetch_async(aconn, name, status):
+async def test_fetch_async(aconn, testtype, name, status):
     status = getattr(TransactionStatus, status)
     if status == TransactionStatus.INTRANS:
         await aconn.execute("select 1")
@@ -42,10 +55,9 @@ async def test_fetch_async(aconn, name, status):
     info = await TypeInfo.fetch(aconn, name)
     assert aconn.info.transaction_status == status
 
-    assert info.name == "text"
-    # assert info.schema == "pg_catalog"
-    assert info.oid == psycopg.adapters.types["text"].oid
-    assert info.array_oid == psycopg.adapters.types["text"].array_oid
+    assert info.name == "testfetch"
+    # assert info.schema == "public"
+    assert (info.oid, info.array_oid) == testtype
 
 
 _name = pytest.mark.parametrize("name", ["nosuch", sql.Identifier("nosuch")])
@@ -65,6 +77,66 @@ _info_cls = pytest.mark.parametrize(
 )
 
 
+@_info_cls
+def test_fetch_row_factory(conn, info_cls):
+    conn.row_factory = dict_row
+    if info_cls is EnumInfo:
+        conn.execute("drop type if exists testenum")
+        conn.execute("create type testenum as enum ('a', 'b')")
+    name = {
+        TypeInfo: "int4",
+        RangeInfo: "int4range",
+        MultirangeInfo: "int4multirange",
+        CompositeInfo: "pg_type",
+        EnumInfo: "testenum",
+    }[info_cls]
+    # Use fetch_many() because fetch() doesn't query the builtin types
+    info = info_cls.fetch_many(conn, [name])[name]
+    assert isinstance(info, info_cls)
+    assert info.name == name
+
+
+@pytest.mark.parametrize(
+    "status, autocommit, block",
+    [("IDLE", False, True), ("IDLE", True, False), ("INTRANS", False, True)],
+)
+def test_fetch_transaction_block(conn, status, autocommit, block, monkeypatch):
+    if not TypeInfo._has_to_regtype_function(conn):
+        pytest.skip("always uses a transaction block without to_regtype()")
+
+    blocks = []
+    enter_orig = psycopg.Transaction.__enter__
+
+    def enter(self):
+        blocks.append(self)
+        return enter_orig(self)
+
+    monkeypatch.setattr(psycopg.Transaction, "__enter__", enter)
+    conn.autocommit = autocommit
+    status = getattr(TransactionStatus, status)
+    if status == TransactionStatus.INTRANS:
+        conn.execute("select 1")
+
+    assert TypeInfo.fetch_many(conn, ["text"])
+    assert not TypeInfo.fetch(conn, "nosuch")
+    assert conn.info.transaction_status == status
+    assert bool(blocks) == block
+
+
+@pytest.mark.parametrize("name", ["foo(", "int4 int4", "a.b.c.d"])
+@pytest.mark.parametrize("fetch_many", [False, True])
+def test_fetch_malformed_name_intrans(conn, name, fetch_many):
+    conn.execute("select 1")
+    assert conn.info.transaction_status == TransactionStatus.INTRANS
+    with pytest.raises(psycopg.errors.SyntaxError):
+        if fetch_many:
+            TypeInfo.fetch_many(conn, ["text", name])
+        else:
+            TypeInfo.fetch(conn, name)
+    assert conn.info.transaction_status == TransactionStatus.INTRANS
+    assert conn.execute("select 1").fetchone() == (1,)
+
+
 @_name
 @_status
 @_info_cls
@@ -113,6 +185,212 @@ async def test_fetch_not_found_async(aconn, name, status, info_cls, monkeypatch)
     assert info is None
 
 
+@pytest.mark.parametrize("regtype_func", [True, False])
+@_status
+def test_fetch_many(conn, status, regtype_func, monkeypatch):
+    if not regtype_func:
+        monkeypatch.setattr(TypeInfo, "_has_to_regtype_function", lambda conn: False)
+    status = getattr(TransactionStatus, status)
+    if status == TransactionStatus.INTRANS:
+        conn.execute("select 1")
+
+    names: List[Union[str, sql.Identifier]]
+    names = ["text", sql.Identifier("int4"), "nosuch", "character varying", "text"]
+    infos = TypeInfo.fetch_many(conn, names)
+    assert conn.info.transaction_status == status
+
+    assert set(infos) == {"text", '"int4"', "character varying"}
+    assert infos["text"].oid == psycopg.adapters.types["text"].oid
+    assert infos['"int4"'].oid == psycopg.adapters.types["int4"].oid
+    assert infos["character varying"].name == "varchar"
+    assert infos["character varying"].regtype == "character varying"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("regtype_func", [True, False])
+@_status
+async def test_fetch_many_async(aconn, status, regtype_func, monkeypatch):
+    if not regtype_func:
+        monkeypatch.setattr(TypeInfo, "_has_to_regtype_function", lambda conn: False)
+    status = getattr(TransactionStatus, status)
+    if status == TransactionStatus.INTRANS:
+        await aconn.execute("select 1")
+
+    names: List[Union[str, sql.Identifier]]
+    names = ["text", sql.Identifier("int4"), "nosuch", "character varying", "text"]
+    infos = await TypeInfo.fetch_many(aconn, names)
+    assert aconn.info.transaction_status == status
+
+    assert set(infos) == {"text", '"int4"', "character varying"}
+    assert infos["text"].oid == psycopg.adapters.types["text"].oid
+    assert infos['"int4"'].oid == psycopg.adapters.types["int4"].oid
+    assert infos["character varying"].name == "varchar"
+
+
+@pytest.mark.parametrize("regtype_func", [True, False])
+def test_fetch_many_pipeline(conn, pipeline, regtype_func, monkeypatch):
+    if not regtype_func:
+        monkeypatch.setattr(TypeInfo, "_has_to_regtype_function", lambda conn: False)
+    infos = TypeInfo.fetch_many(conn, ["text", "nosuch", "int4"])
+    assert set(infos) == {"text", "int4"}
+    assert conn.execute("select 1").fetchone() == (1,)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("regtype_func", [True, False])
+async def test_fetch_many_pipeline_async(aconn, apipeline, regtype_func, monkeypatch):
+    if not regtype_func:
+        monkeypatch.setattr(TypeInfo, "_has_to_regtype_function", lambda conn: False)
+    infos = await TypeInfo.fetch_many(aconn, ["text", "nosuch", "int4"])
+    assert set(infos) == {"text", "int4"}
+    cur = await aconn.execute("select 1")
+    assert await cur.fetchone() == (1,)
+
+
+@_info_cls
+def test_fetch_many_not_found(conn, info_cls):
+    assert info_cls.fetch_many(conn, []) == {}
+    assert info_cls.fetch_many(conn, ["nosuch", sql.Identifier("nosuch")]) == {}
+
+
+def test_fetch_many_records(conn, monkeypatch):
+    recs = [
+        ("integer", "int4", 23, 1007, "integer", ","),
+        ("text", "text", 25, 1009, "text", ","),
+    ]
+    monkeypatch.setattr(TypeInfo, "_execute", lambda conn, query, params: recs)
+    infos = TypeInfo.fetch_many(conn, ["integer", "text"])
+    assert list(infos) == ["integer", "text"]
+    assert type(infos["integer"]) is TypeInfo
+    assert infos["integer"].name == "int4"
+    assert infos["integer"].regtype == "integer"
+    assert infos["text"].array_oid == 1009
+
+    recs.append(recs[0])
+    with pytest.raises(psycopg.ProgrammingError, match="more than one"):
+        TypeInfo.fetch_many(conn, ["integer", "text"])
+
+
+@pytest.mark.crdb_skip("range")
+def test_fetch_many_range(conn):
+    infos = RangeInfo.fetch_many(conn, ["int4range", "nosuch", "daterange"])
+    assert set(infos) == {"int4range", "daterange"}
+    assert infos["int4range"].subtype_oid == psycopg.adapters.types["int4"].oid
+    assert infos["daterange"].subtype_oid == psycopg.adapters.types["date"].oid
+
+
+@pytest.mark.parametrize("status", ["IDLE", "INTRANS"])
+def test_fetch_base_types(conn, status):
+    status = getattr(TransactionStatus, status)
+    if status == TransactionStatus.INTRANS:
+        conn.execute("select 1")
+
+    infos = TypeInfo.fetch_base_types(conn)
+    assert all(type(info) is TypeInfo for info in infos)
+    oids = [info.oid for info in infos]
+    assert oids == sorted(oids)
+    byname = {info.name: info for info in infos}
+    assert byname["text"].array_oid == psycopg.adapters.types["text"].array_oid
+    assert byname["int4"].oid == psycopg.adapters.types["int4"].oid
+    assert "_text" not in byname
+    assert "pg_type" not in byname
+    assert conn.info.transaction_status == status
+
+
+@pytest.mark.parametrize(
+    "status, autocommit, block",
+    [("IDLE", False, True), ("IDLE", True, False), ("INTRANS", False, False)],
+)
+def test_fetch_base_types_transaction_block(
+    conn, status, autocommit, block, monkeypatch
+):
+    # The query can't fail, even without to_regtype()
+    monkeypatch.setattr(TypeInfo, "_has_to_regtype_function", lambda conn: False)
+    blocks = []
+    enter_orig = psycopg.Transaction.__enter__
+
+    def enter(self):
+        blocks.append(self)
+        return enter_orig(self)
+
+    monkeypatch.setattr(psycopg.Transaction, "__enter__", enter)
+    conn.autocommit = autocommit
+    status = getattr(TransactionStatus, status)
+    if status == TransactionStatus.INTRANS:
+        conn.execute("select 1")
+
+    assert TypeInfo.fetch_base_types(conn)
+    assert conn.info.transaction_status == status
+    assert bool(blocks) == block
+
+
+async def test_fetch_base_types_async(aconn):
+    infos = await TypeInfo.fetch_base_types(aconn)
+    byname = {info.name: info for info in infos}
+    assert byname["int4"].oid == psycopg.adapters.types["int4"].oid
+    assert "_int4" not in byname
+
+
+def test_fetch_base_types_oids(conn):
+    oids = [psycopg.adapters.types[name].oid for name in ["int4", "int4[]", "text"]]
+    infos = TypeInfo.fetch_base_types(conn, iter(oids))
+    assert [info.name for info in infos] == ["int4", "text"]
+    assert TypeInfo.fetch_base_types(conn, []) == []
+
+
+@pytest.mark.parametrize("info_cls", [RangeInfo, CompositeInfo])
+def test_fetch_base_types_subclass(conn, info_cls):
+    with pytest.raises(TypeError, match=info_cls.__name__):
+        info_cls.fetch_base_types(conn)
+
+
+@_info_cls
+def test_info_query_cached(conn, info_cls):
+    query = info_cls._get_info_query(conn)
+    assert info_cls._get_info_query(conn) is query
+    if info_cls is not TypeInfo:
+        assert TypeInfo._get_info_query(conn) is not query
+
+
+@pytest.mark.crdb_skip("encoding")
+def test_info_query_encoding(conn):
+    query = TypeInfo._get_info_query(conn)
+    assert isinstance(query, bytes)
+    conn.execute("set client_encoding to latin1")
+    assert TypeInfo._get_info_query(conn) is not query
+    assert TypeInfo._get_info_query(conn) == query
+    assert TypeInfo.fetch(conn, "text")
+
+
+def test_to_regtype_support_cached(conn_cls, dsn, monkeypatch):
+    conn = conn_cls.connect(dsn)
+    rv = TypeInfo._has_to_regtype_function(conn)
+    monkeypatch.setattr(conn_cls, "info", property(lambda self: 1 / 0))
+    assert TypeInfo._has_to_regtype_function(conn) is rv
+    monkeypatch.undo()
+    conn.close()
+
+
+def test_fetch_registered(conn):
+    info = TypeInfo.fetch(conn, "text")
+    assert info is not conn.adapters.types["text"]
+    assert info.oid == conn.adapters.types["text"].oid
+
+    conn.execute("create type testfetchreg as enum ('a')")
+    oid = conn.execute("select 'testfetchreg'::regtype::oid").fetchone()[0]
+    # Registered e.g. globally, from a different database
+    TypeInfo("testfetchreg", 999999, 999998).register(conn)
+    info = TypeInfo.fetch(conn, "testfetchreg")
+    assert info.oid == oid
+
+
+@pytest.mark.crdb_skip("range")
+def test_fetch_multirange_not_supported(conn, monkeypatch):
+    monkeypatch.setattr(psycopg.ConnectionInfo, "server_version", 130000)
+    with pytest.raises(psycopg.NotSupportedError):
+        MultirangeInfo.fetch(conn, "int4multirange")
+
+
 @pytest.mark.crdb_skip("composite")
 @pytest.mark.parametrize(
     "name", ["testschema.testtype", sql.Identifier("testschema", "testtype")]
@@ -149,6 +427,22 @@ def test_registry_by_builtin_name(conn, name):
     assert info.oid == 25
 
 
+@pytest.mark.parametrize(
+    "info",
+    [
+        TypeInfo("t", 100001, 100002),
+        RangeInfo("t", 100001, 100002, subtype_oid=23),
+        MultirangeInfo("t", 100001, 100002, range_oid=3904, subtype_oid=23),
+        CompositeInfo("t", 100001, 100002, field_names=["a"], field_types=[23]),
+        EnumInfo("t", 100001, 100002, labels=["a"]),
+    ],
+)
+def test_info_slots(info):
+    assert not hasattr(info, "__dict__")
+    with pytest.raises(AttributeError):
+        info.foo = 1
+
+
 def test_registry_empty():
     r = psycopg.types.TypesRegistry()
     assert r.get("text") is None
@@ -170,6 +464,46 @@ def test_registry_invalid_oid(oid, aoid):
         r[0]
 
 
+def test_registry_get_by_oid():
+    r = psycopg.types.TypesRegistry(psycopg.postgres.types)
+    assert r.get_by_oid(25) is r["text"]
+    assert r.get_by_oid(1009) is r["text"]
+    assert r.get_by_oid(0) is None
+    assert r.get_by_oid(999999) is None
+
+
+@pytest.mark.parametrize("oid", [5000, 100000])
+def test_registry_get_by_oid_added(oid):
+    orig = psycopg.types.TypesRegistry(psycopg.postgres.types)
+    r = psycopg.types.TypesRegistry(orig)
+    t1 = psycopg.types.TypeInfo("t1", oid, oid + 1)
+    r.add(t1)
+    assert r.get_by_oid(oid) is r.get_by_oid(oid + 1) is r[oid] is t1
+    assert orig.get_by_oid(oid) is None
+
+    t2 = psycopg.types.TypeInfo("t2", oid, 0)
+    r.add(t2)
+    assert r.get_by_oid(oid) is r[oid] is t2
+    assert r.get_by_oid(oid + 1) is t1
+
+    r.clear()
+    assert r.get_by_oid(oid) is None
+    assert r.get_by_oid(25) is None
+
+
+@pytest.mark.parametrize("name", ["text", "int4", "integer", "character varying"])
+def test_registry_array_name(name):
+    r = psycopg.types.TypesRegistry(psycopg.postgres.types)
+    assert r[f"{name}[]"] is r[name]
+    assert r.get_oid(f"{name}[]") == r[name].array_oid
+
+
+def test_registry_bad_key():
+    r = psycopg.types.TypesRegistry(psycopg.postgres.types)
+    with pytest.raises(TypeError):
+        r[25.0]  # type: ignore[call-overload]
+
+
 def test_registry_copy():
     r = psycopg.types.TypesRegistry(psycopg.postgres.types)
     assert r.get("text") is r["text"] is r[25]
@@ -184,3 +518,114 @@ def test_registry_isolated():
     r.add(tdummy)
     assert r[25] is r["dummy"] is tdummy
     assert orig[25] is r["text"] is tinfo
+
+
+def test_registry_template_add():
+    orig = psycopg.types.TypesRegistry(psycopg.postgres.types)
+    r = psycopg.types.TypesRegistry(orig)
+    assert r._registry is orig._registry
+    t1 = psycopg.types.TypeInfo("t1", 100001, 100002)
+    orig.add(t1)
+    assert orig["t1"] is t1
+    assert r.get("t1") is None
+    t2 = psycopg.types.TypeInfo("t2", 100003, 100004)
+    r.add(t2)
+    assert r["t2"] is t2
+    assert orig.get("t2") is None
+    assert r["text"] is orig["text"]
+
+
+def test_registry_iter():
+    r = psycopg.types.TypesRegistry()
+    t1 = psycopg.types.TypeInfo("t1", 100001, 100002)
+    t2 = psycopg.types.TypeInfo("t2", 100003, 0, regtype="tee two")
+    r.add(t1)
+    r.add(t2)
+    r.add(t1)
+    assert list(r) == [t1, t2]
+
+    r2 = psycopg.types.TypesRegistry(r)
+    t3 = psycopg.types.TypeInfo("t3", 100004, 100005)
+    r2.add(t3)
+    assert list(r2) == [t1, t2, t3]
+    assert list(r) == [t1, t2]
+
+
+def test_registry_iter_replaced():
+    r = psycopg.types.TypesRegistry()
+    for i in range(3):
+        t1 = psycopg.types.TypeInfo("mytype", 100001, 100002)
+        r.add(t1)
+    t2 = psycopg.types.TypeInfo("noid", 0, 0)
+    r.add(t2)
+    r.add(psycopg.types.TypeInfo("noid", 0, 0))
+    assert len(list(r)) == 2
+    assert list(r)[0] is t1
+    assert list(r)[1] is not t2
+
+
+@pytest.mark.parametrize("registry", ["postgres", "crdb"])
+def test_registry_bulk_add(registry):
+    if registry == "postgres":
+        infos = list(psycopg.postgres.types)
+    else:
+        crdb = pytest.importorskip("psycopg.crdb")
+        infos = list(crdb.adapters.types)
+
+    r1 = psycopg.types.TypesRegistry()
+    for info in infos:
+        r1.add(info)
+    r2 = psycopg.types.TypesRegistry()
+    r2.bulk_add(infos)
+
+    assert list(r1) == list(r2) == infos
+    assert r1._registry == r2._registry
+
+
+@pytest.mark.parametrize("subtype_first", [True, False])
+def test_registry_get_by_subtype(subtype_first):
+    r = psycopg.types.TypesRegistry()
+    t = psycopg.types.TypeInfo("sub", 100001, 100002, regtype="sub type")
+    rng = RangeInfo("subrange", 100003, 100004, subtype_oid=t.oid)
+    r.bulk_add([t, rng] if subtype_first else [rng, t])
+    assert r.get_by_subtype(RangeInfo, 100001) is rng
+    assert r.get_by_subtype(RangeInfo, "sub") is rng
+    assert r.get_by_subtype(RangeInfo, "sub type") is rng
+    assert r.get_by_subtype(RangeInfo, "nosuch") is None
+    assert r.get_by_subtype(RangeInfo, 100003) is None
+
+    # A range over the array of the type doesn't replace the range by name
+    arng = RangeInfo("subarrrange", 100005, 100006, subtype_oid=t.array_oid)
+    r.add(arng)
+    assert r.get_by_subtype_oid(RangeInfo, 100002) is arng
+    assert r.get_by_subtype(RangeInfo, 100001) is rng
+    assert r.get_by_subtype(RangeInfo, "sub") is rng
+    assert r.get_by_subtype(RangeInfo, "sub type") is rng
+
+
+def test_registry_get_by_subtype_replaced():
+    r = psycopg.types.TypesRegistry()
+    t = psycopg.types.TypeInfo("sub", 100001, 0)
+    rng = RangeInfo("subrange", 100003, 0, subtype_oid=t.oid)
+    r.bulk_add([t, rng])
+    assert r.get_by_subtype(RangeInfo, "sub") is rng
+
+    # The type dropped and created again
+    r.add(psycopg.types.TypeInfo("sub", 200001, 0))
+    assert r.get_by_subtype(RangeInfo, "sub") is None
+    assert r.get_by_subtype(RangeInfo, 100001) is rng
+
+    rng2 = RangeInfo("subrange", 200003, 0, subtype_oid=200001)
+    r.add(rng2)
+    assert r.get_by_subtype(RangeInfo, "sub") is rng2
+
+
+def test_registry_get_by_subtype_oid():
+    types = psycopg.postgres.types
+    info = types.get_by_subtype_oid(RangeInfo, types["int4"].oid)
+    assert info is types["int4range"]
+    assert types.get_by_subtype_oid(RangeInfo, types["int4range"].oid) is None
+    assert (
+        types.get_by_subtype_oid(MultirangeInfo, types["int4"].oid)
+        is types["int4multirange"]
+    )